@@ -16,87 +16,302 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 '''
 
+import math
+import time
+
 import bpy
 import bmesh
-from mathutils import Vector
+import numpy as np
+from bpy.app.handlers import persistent
+
+from . import _kernels
 
 # -----------------------------
 # Globals
 # -----------------------------
 _hidden_faces_cache = {}
-_timer_interval = 0.05
+_last_state = {}
+_inverse_matrix_cache = {}
+_geometry_cache = {}
+_geometry_dirty = set()
+_syncing_uid = None
+_watched_uid = None
+_watched_update = None
+_update_window = None
+_update_delay = 0.0
+_max_update_delay = 0.5
+
+# View changes smaller than this are ignored, faces only flip when they cross edge-on
+_view_angle_tolerance = math.radians(0.5)
+_view_rotation_min_dot = math.cos(_view_angle_tolerance / 2)
+
+# Scratch arrays shared by all updates, grown to fit the largest mesh seen
+_pool = {
+    "interleaved": np.empty(0, dtype=np.float32),
+    "normals": np.empty(0, dtype=np.float32),
+    "centers": np.empty(0, dtype=np.float32),
+    "offsets": np.empty(0, dtype=np.float32),
+    "hide": np.empty(0, dtype=bool),
+    "packed_a": np.empty(0, dtype=np.uint8),
+    "packed_b": np.empty(0, dtype=np.uint8),
+}
 
 # -----------------------------
 # Utilities
 # -----------------------------
-def get_view_direction(context):
-    """Return view direction in world space for active 3D view."""
+def get_view_region(context):
+    """Return the region data of the active 3D view."""
     for area in context.screen.areas:
         if area.type == 'VIEW_3D':
             for region in area.regions:
                 if region.type == 'WINDOW':
                     rv3d = region.data if hasattr(region, "data") else area.spaces.active.region_3d
                     if rv3d:
-                        return rv3d.view_rotation @ Vector((0, 0, -1)), rv3d
-    return None, None
-
-def update_backfaces(obj, context, debug=False):
-    """Hide/show faces depending on view direction or if in front of camera."""
-    # Only operate on active object in edit mode
-    if context.mode != 'EDIT_MESH' or obj is None or obj != context.object:
-        return
-
+                        return rv3d
+    return None
+
+def pool_view(name, size):
+    """Return the first size elements of a scratch array, growing it if needed."""
+    buffer = _pool[name]
+    if buffer.shape[0] < size:
+        buffer = _pool[name] = np.empty(size, dtype=buffer.dtype)
+    return buffer[:size]
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Flag objects whose geometry was edited since their last update."""
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, bpy.types.Object):
+            uid = update.id.original.session_uid
+            # Ignore the update caused by our own edit-mesh sync
+            if uid != _syncing_uid:
+                _geometry_dirty.add(uid)
+
+def flush_own_updates(context, uid):
+    """Evaluate our own writes to uid right away, so they aren't mistaken for edits."""
+    global _syncing_uid
+    _syncing_uid = uid
+    try:
+        context.evaluated_depsgraph_get()
+    finally:
+        _syncing_uid = None
+
+def make_update(obj, debug=False):
+    """Build the update function for obj, binding everything that is fixed per object."""
     mesh = obj.data
-    bm = bmesh.from_edit_mesh(mesh)
+    uid = obj.session_uid
+    backface_bits = _kernels.get_backface_bits()
+
+    def update_backfaces(context, rv3d):
+        """Hide/show faces depending on view direction or if in front of camera."""
+        if rv3d is None:
+            return None
+
+        view_rotation = rv3d.view_rotation
+        cam_pos = rv3d.view_matrix.inverted().translation  # Camera position in world space
+
+        # Skip when the object and its geometry are unchanged and the view has barely
+        # moved since the last update. Topology changes are caught by the depsgraph handler.
+        matrix_key = tuple(map(tuple, obj.matrix_world))
+        state = (matrix_key, context.scene.auto_hide_backfaces_flip)
+        geometry_dirty = uid in _geometry_dirty
+        last = _last_state.get(uid)
+        if (not geometry_dirty and last is not None and last[0] == state
+                and abs(last[1].dot(view_rotation)) > _view_rotation_min_dot
+                and (last[2] - cam_pos).length <= rv3d.view_distance * _view_angle_tolerance):
+            return None
+        _geometry_dirty.discard(uid)
+        # Only remember views that were applied, so small moves can't add up unnoticed
+        _last_state[uid] = (state, view_rotation.copy(), cam_pos)
+
+        # Face data only depends on the geometry, so it is read once and reused until
+        # the mesh is edited. View changes then only rerun the kernel. The edit-mesh
+        # face count is checked too, in case an edit was missed by the depsgraph handler.
+        faces = bmesh.from_edit_mesh(mesh).faces
+        geometry = _geometry_cache.get(uid)
+        cached = _hidden_faces_cache.get(uid)
+        if (geometry_dirty or geometry is None or cached is None
+                or geometry[0] != len(faces)):
+            # Sync the edit-mesh into the mesh data so polygon attributes can be read in bulk
+            obj.update_from_editmode()
+            polygons = mesh.polygons
+            face_count = len(polygons)
+
+            # Polygon attributes come out interleaved (xyzxyz...), store them per component
+            # (xxx..., yyy..., zzz...) so the kernel reads contiguous arrays
+            interleaved = pool_view("interleaved", face_count * 3)
+            normals = pool_view("normals", face_count * 3).reshape(3, face_count)
+            centers = pool_view("centers", face_count * 3).reshape(3, face_count)
+            polygons.foreach_get("normal", interleaved)
+            normals[:] = interleaved.reshape(face_count, 3).T
+            polygons.foreach_get("center", interleaved)
+            centers[:] = interleaved.reshape(face_count, 3).T
+
+            # Keep each face's plane offset instead of its center, dot(n, c)
+            offsets = pool_view("offsets", face_count)
+            np.einsum('ij,ij->j', normals, centers, out=offsets)
+            geometry = (face_count, normals, offsets)
+            _geometry_cache[uid] = geometry
+
+            # The hide state may have been changed by the edit, read it back
+            hide_state = pool_view("hide", face_count)
+            polygons.foreach_get("hide", hide_state)
+            prev_packed = np.packbits(hide_state)
+        else:
+            # The cached mask is the hide state we last wrote
+            prev_packed = cached[2]
+        face_count, normals, offsets = geometry
+
+        # Bring the camera into object space once instead of transforming every face,
+        # the facing test gives the same result in either space. The inverse is only
+        # rebuilt when the object is transformed.
+        cached_matrix = _inverse_matrix_cache.get(uid)
+        if cached_matrix is None or cached_matrix[0] != matrix_key:
+            cached_matrix = (matrix_key, obj.matrix_world.inverted_safe())
+            _inverse_matrix_cache[uid] = cached_matrix
+        cam_local = cached_matrix[1] @ cam_pos
+
+        # Determine which faces are backfaces, packed 8 faces per byte, applying flip mode.
+        # Alternate between two packed buffers so the previous mask stays intact.
+        packed_name = "packed_b" if np.may_share_memory(prev_packed, _pool["packed_a"]) else "packed_a"
+        new_packed = pool_view(packed_name, (face_count + 7) // 8)
+        backface_bits(
+            normals, offsets, np.asarray(cam_local, dtype=np.float32),
+            context.scene.auto_hide_backfaces_flip, new_packed
+        )
+
+        _hidden_faces_cache[uid] = (obj, face_count, new_packed)
+
+        # Nothing to do if the hide state already matches
+        diff = np.bitwise_xor(prev_packed, new_packed)
+        changed_bytes = np.flatnonzero(diff)
+        if changed_bytes.size == 0:
+            return None
+
+        # Only unpack the bytes that changed to find the faces that flipped
+        rows, bits = np.nonzero(np.unpackbits(diff[changed_bytes]).reshape(-1, 8))
+        flipped_idx = changed_bytes[rows] * 8 + bits
+        flipped_hide = (new_packed[changed_bytes[rows]] >> (7 - bits)) & 1
+
+        # Edit-mesh hide flags can't be set in bulk, write only the flipped faces
+        faces.ensure_lookup_table()
+        for idx, hide in zip(flipped_idx.tolist(), flipped_hide.astype(bool).tolist()):
+            faces[idx].hide = hide
 
-    view_dir, rv3d = get_view_direction(context)
-    if view_dir is None:
+        bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
+        return flipped_idx.size, new_packed
+
+    if not debug:
+        return update_backfaces
+
+    # Debug printing lives in a wrapper so the regular update has no debug branch
+    def update_backfaces_debug(context, rv3d):
+        result = update_backfaces(context, rv3d)
+        if result is not None:
+            flipped, new_packed = result
+            print(f"[DEBUG] Updated backfaces for {obj.name}: flipped {flipped} faces, "
+                  f"hidden {np.count_nonzero(np.unpackbits(new_packed))} faces")
+        return result
+
+    return update_backfaces_debug
+
+def reveal_faces(obj, face_count, packed):
+    """Unhide the faces recorded as hidden in a packed mask."""
+    # The object may have been deleted since it was cached
+    try:
+        mesh = obj.data
+    except ReferenceError:
+        return
+    hidden = np.unpackbits(packed, count=face_count).view(bool)
+
+    if mesh.is_editmode:
+        faces = bmesh.from_edit_mesh(mesh).faces
+        faces.ensure_lookup_table()
+        indices = np.flatnonzero(hidden)
+        for idx in indices[indices < len(faces)].tolist():
+            faces[idx].hide = False
+        bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
         return
 
-    cam_pos = rv3d.view_matrix.inverted().translation  # Camera position in world space
-    normal_matrix = obj.matrix_world.to_3x3()
-    hidden_faces = _hidden_faces_cache.get(obj.name, set())
-    new_hidden = set()
-    changed = False
-
-    # Add a scene property:
-    bpy.types.Scene.auto_hide_backfaces_flip = bpy.props.BoolProperty(
-        name="Hide Inner Normals",
-        default=True,
-        description="Invert which faces are considered 'backfaces'"
-    )
-
-    # In update_backfaces():
-    for face in bm.faces:
-        face_world_normal = normal_matrix @ face.normal
-        face_center = obj.matrix_world @ face.calc_center_median()
-
-        # Vector from face to camera
-        face_to_cam = (cam_pos - face_center).normalized()
-        # Determine if the face is facing the camera
-        is_facing_camera = face_world_normal.dot(face_to_cam) > 0
+    # Edit mode was left, the hide flags are in the mesh data and can be cleared in bulk
+    polygons = mesh.polygons
+    if len(polygons) != face_count:
+        return
+    hide_state = np.empty(face_count, dtype=bool)
+    polygons.foreach_get("hide", hide_state)
+    revealed = hidden & hide_state
+    hide_state[hidden] = False
+    polygons.foreach_set("hide", hide_state)
+
+    # Also reveal the edges and vertices of those faces, face loops are stored in order
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    polygons.foreach_get("loop_total", loop_totals)
+    revealed_loops = np.repeat(revealed, loop_totals)
+    for elements, loop_attribute in ((mesh.vertices, "vertex_index"), (mesh.edges, "edge_index")):
+        loop_elements = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get(loop_attribute, loop_elements)
+        element_hide = np.empty(len(elements), dtype=bool)
+        elements.foreach_get("hide", element_hide)
+        element_hide[loop_elements[revealed_loops]] = False
+        elements.foreach_set("hide", element_hide)
+    mesh.update()
+
+def watch_object(obj):
+    """Make obj the only watched object, restoring faces hidden on the previous one."""
+    global _watched_uid, _watched_update
+    uid = obj.session_uid
+    if uid == _watched_uid and _watched_update is not None:
+        return
+    _watched_uid = uid
+    _watched_update = make_update(obj, bpy.context.scene.auto_hide_backfaces_debug)
+    for other_uid in [key for key in _hidden_faces_cache if key != uid]:
+        reveal_faces(*_hidden_faces_cache.pop(other_uid))
+        _last_state.pop(other_uid, None)
+        _inverse_matrix_cache.pop(other_uid, None)
+        _geometry_cache.pop(other_uid, None)
+
+def request_update():
+    """Draw callback, defer the update until the 3D view has finished drawing."""
+    global _update_window
+    context = bpy.context
+
+    # Don't update during playback or while a transform is running, the redraw
+    # that follows will pick the changes up
+    if context.screen.is_animation_playing:
+        return
+    if any(op.bl_idname.startswith("TRANSFORM_OT") for op in context.window.modal_operators):
+        return
 
-        # Apply flip mode
-        if context.scene.auto_hide_backfaces_flip:
-            is_backface = not is_facing_camera
-        else:
-            is_backface = is_facing_camera
-
-        if is_backface and not face.hide:
-            face.hide = True
-            new_hidden.add(face.index)
-            changed = True
-        elif not is_backface and face.hide:
-            face.hide = False
-            changed = True
-        elif is_backface:
-            new_hidden.add(face.index)
-
-    if changed:
-        bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
-        _hidden_faces_cache[obj.name] = new_hidden
-        if debug:
-            print(f"[DEBUG] Updated backfaces for {obj.name}: hidden {len(new_hidden)} faces")
+    # Coalesce redraws into a single pending update
+    _update_window = context.window
+    if not bpy.app.timers.is_registered(run_update):
+        bpy.app.timers.register(run_update, first_interval=_update_delay)
+
+def run_update():
+    """One-shot timer, update the active object in the window that was redrawn."""
+    global _update_delay
+    window = _update_window
+    if window is None or window not in bpy.context.window_manager.windows[:]:
+        return None
+
+    with bpy.context.temp_override(window=window):
+        context = bpy.context
+        if context.scene.auto_hide_backfaces_enabled and context.mode == 'EDIT_MESH':
+            # Only update active object
+            active_obj = context.object
+            if active_obj and active_obj.type == 'MESH':
+                watch_object(active_obj)
+                # Look up the view once per update rather than inside update_backfaces
+                start = time.perf_counter()
+                rv3d = get_view_region(context)
+                _watched_update(context, rv3d)
+                # Syncing and hiding faces doesn't move them, evaluate those writes now, before
+                # any user edit can be evaluated together with them, so the geometry stays cached
+                flush_own_updates(context, active_obj.session_uid)
+                # Space out updates on heavy meshes so they can't queue up faster than they finish,
+                # capped so a one-off slow update (geometry re-read, kernel compile) can't stall orbiting
+                _update_delay = min(_max_update_delay, 2.0 * (time.perf_counter() - start))
+    return None
 
 # -----------------------------
 # Modal Operator
@@ -105,10 +320,10 @@ class VIEW3D_OT_auto_hide_backface_modal(bpy.types.Operator):
     bl_idname = "view3d.auto_hide_backface_modal"
     bl_label = "Auto Hide Backface Modal"
 
-    _timer = None
+    _handle = None
 
     # -----------------------------
-    # Modal event loop
+    # Modal event loop, only watches for the feature being turned off
     # -----------------------------
     def modal(self, context, event):
 
@@ -118,14 +333,10 @@ class VIEW3D_OT_auto_hide_backface_modal(bpy.types.Operator):
 
         # Stop modal if not in edit mode
         if context.mode != 'EDIT_MESH':
+            self.cancel(context)
             context.scene.auto_hide_backfaces_enabled = False
             return {'CANCELLED'}
 
-        # Only update active object
-        active_obj = context.object
-        if active_obj and active_obj.type == 'MESH':
-            update_backfaces(active_obj, context, context.scene.auto_hide_backfaces_debug)
-
         return {'PASS_THROUGH'}
 
     # -----------------------------
@@ -133,7 +344,14 @@ class VIEW3D_OT_auto_hide_backface_modal(bpy.types.Operator):
     # -----------------------------
     def execute(self, context):
         wm = context.window_manager
-        self._timer = wm.event_timer_add(_timer_interval, window=context.window)
+        # Bind the update function to the active object up front
+        if context.object and context.object.type == 'MESH':
+            watch_object(context.object)
+        # Updates are driven by viewport redraws instead of a polling timer
+        self._handle = bpy.types.SpaceView3D.draw_handler_add(request_update, (), 'WINDOW', 'POST_VIEW')
+        # Only track geometry edits while the feature is running
+        if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
         wm.modal_handler_add(self)
         if context.scene.auto_hide_backfaces_debug:
             print("[DEBUG] Auto-Hide Backface Modal started")
@@ -144,23 +362,35 @@ class VIEW3D_OT_auto_hide_backface_modal(bpy.types.Operator):
     # Cancel and cleanup
     # -----------------------------
     def cancel(self, context):
-        wm = context.window_manager
-        if self._timer:
-            wm.event_timer_remove(self._timer)
+        self.remove_handler()
         self.unhide_all(context)
         if context.scene.auto_hide_backfaces_debug:
             print("[DEBUG] Auto-Hide Backface Modal stopped")
 
+    def remove_handler(self):
+        if self._handle:
+            bpy.types.SpaceView3D.draw_handler_remove(self._handle, 'WINDOW')
+            self._handle = None
+        if bpy.app.timers.is_registered(run_update):
+            bpy.app.timers.unregister(run_update)
+        if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+
     def unhide_all(self, context):
-        obj = context.object
-        if obj and obj.type == 'MESH':
-            bm = bmesh.from_edit_mesh(obj.data)
-            indices = _hidden_faces_cache.get(obj.name, set())
-            for idx in indices:
-                if idx < len(bm.faces):
-                    bm.faces[idx].hide = False
-            bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
+        global _watched_uid, _watched_update, _update_delay
+        for cached in _hidden_faces_cache.values():
+            reveal_faces(*cached)
         _hidden_faces_cache.clear()
+        _watched_uid = None
+        _watched_update = None
+        _update_delay = 0.0
+        _last_state.clear()
+        _inverse_matrix_cache.clear()
+        _geometry_cache.clear()
+        _geometry_dirty.clear()
+        # Release the scratch arrays, they are sized for the largest mesh seen
+        for name, buffer in _pool.items():
+            _pool[name] = np.empty(0, dtype=buffer.dtype)
 
 
 # -----------------------------
@@ -191,6 +421,11 @@ def toggle_modal(self, context):
             return
         bpy.ops.view3d.auto_hide_backface_modal('INVOKE_DEFAULT')
 
+def toggle_debug(self, context):
+    global _watched_update
+    # Rebuilt with or without debug printing on the next update
+    _watched_update = None
+
 # -----------------------------
 # Registration
 # -----------------------------
@@ -202,17 +437,26 @@ def register():
     )
     bpy.types.Scene.auto_hide_backfaces_debug = bpy.props.BoolProperty(
         name="Enable Debug Printing",
-        default=False
+        default=False,
+        update=toggle_debug
+    )
+    bpy.types.Scene.auto_hide_backfaces_flip = bpy.props.BoolProperty(
+        name="Hide Inner Normals",
+        default=True,
+        description="Invert which faces are considered 'backfaces'"
     )
 
     bpy.utils.register_class(VIEW3D_OT_auto_hide_backface_modal)
     bpy.utils.register_class(VIEW3D_PT_auto_hide_backface_panel)
 
 def unregister():
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
     bpy.utils.unregister_class(VIEW3D_PT_auto_hide_backface_panel)
     bpy.utils.unregister_class(VIEW3D_OT_auto_hide_backface_modal)
     del bpy.types.Scene.auto_hide_backfaces_enabled
     del bpy.types.Scene.auto_hide_backfaces_debug
+    del bpy.types.Scene.auto_hide_backfaces_flip
 
 if __name__ == "__main__":
     register()
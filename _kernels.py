@@ -0,0 +1,70 @@
+'''
+Auto-Hide Backfaces - Automatic backface hider for Blender 5
+Copyright (C) 2025 LunaMoca
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+import numpy as np
+
+# Picked on first use, see get_backface_bits()
+_backface_bits = None
+
+# -----------------------------
+# Kernels
+# -----------------------------
+# Both kernels take normals as a (3, N) array, one contiguous row per component,
+# and the plane offset dot(normal, center) of each face. A face is facing point
+# when dot(normal, point) > offset. The backface flags are written straight into
+# a packed bit array (np.packbits layout, first face in the high bit), so the
+# caller never materializes a per-face mask unless faces have to be written.
+def backface_bits_numpy(normals, offsets, point, flip, out_bits):
+    """Pack into out_bits whether each face is a backface as seen from point."""
+    dot = normals[0] * point[0]
+    dot += normals[1] * point[1]
+    dot += normals[2] * point[2]
+    out_bits[:] = np.packbits((dot > offsets) != flip)
+
+def build_backface_bits_numba():
+    """Compile the Numba kernel, importing Numba only when it is first needed."""
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def backface_bits_numba(normals, offsets, point, flip, out_bits):
+        """Pack into out_bits whether each face is a backface, 8 faces per iteration."""
+        face_count = normals.shape[1]
+        px, py, pz = point[0], point[1], point[2]
+        for b in prange(out_bits.shape[0]):
+            byte = 0
+            for j in range(8):
+                i = b * 8 + j
+                if i < face_count:
+                    dot = normals[0, i] * px + normals[1, i] * py + normals[2, i] * pz
+                    if (dot > offsets[i]) != flip:
+                        byte |= 0x80 >> j
+            out_bits[b] = byte
+
+    return backface_bits_numba
+
+def get_backface_bits():
+    """Return the fastest available kernel, Numba if the user has installed it."""
+    global _backface_bits
+    if _backface_bits is None:
+        # Numba isn't bundled with Blender, and importing it is slow, so it is
+        # only tried once the feature is first used rather than at add-on load
+        try:
+            _backface_bits = build_backface_bits_numba()
+        except ImportError:
+            _backface_bits = backface_bits_numpy
+    return _backface_bits